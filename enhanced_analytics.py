@@ -2,23 +2,315 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import datetime
 import numpy as np
 from utils.data_manager import get_courses_df, get_carry_marks_df, get_assignments_df
-from utils.calculations import calculate_carry_percentage, calculate_current_grade, get_grade_letter, calculate_completion_rate
+from utils.calculations import calculate_completion_rate, compute_course_percentages, compute_course_contributions, get_grade_letters
+
+# Letter grades from best to worst, used to order the grade categorical
+GRADE_ORDER = ['A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-', 'F', 'N/A']
+GRADE_COLORS = {
+    'A+': '#006837', 'A': '#1A9850', 'A-': '#66BD63',
+    'B+': '#A6D96A', 'B': '#D9EF8B', 'B-': '#FEE08B',
+    'C+': '#FDAE61', 'C': '#F46D43', 'C-': '#D73027',
+    'F': '#A50026', 'N/A': '#BDBDBD'
+}
+
+# Above these sizes the trend chart drops spline smoothing, then markers and SVG rendering
+TREND_SPLINE_MAX_POINTS = 200
+TREND_MARKERS_MAX_POINTS = 500
+
+# Seconds to keep cached frames and figures for data that is no longer current
+CACHE_TTL = 600
+
+def _load_all():
+    """Load the analytics DataFrames from the session-cached loaders"""
+    courses_df = get_courses_df()
+    carry_marks_df = get_carry_marks_df()
+    assignments_df = get_assignments_df()
+    
+    # Derive percentage once here instead of at every use in the tab
+    if 'percentage' not in carry_marks_df.columns:
+        carry_marks_df['percentage'] = (carry_marks_df['earned'] / carry_marks_df['max_possible'] * 100).fillna(0)
+    
+    # Parse dates once so the tab never re-parses the strings
+    if 'date_added' in carry_marks_df.columns:
+        carry_marks_df['date_added'] = pd.to_datetime(carry_marks_df['date_added'])
+    # get_assignments_df already parses due_date; this only types the empty fallback frame
+    if 'due_date' in assignments_df.columns:
+        assignments_df['due_date'] = pd.to_datetime(assignments_df['due_date'], errors='coerce')
+    
+    return courses_df, carry_marks_df, assignments_df
+
+def _plot_frame(df):
+    """Copy of df with float columns narrowed to float32 for plotting"""
+    return df.astype({col: 'float32' for col in df.select_dtypes('float64').columns})
+
+# Figures are only read by st.plotly_chart, so they are cached as shared resources
+# rather than with st.cache_data, which would unpickle a fresh copy on every rerun
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _make_grades_fig(course_stats_df):
+    """Average performance bar chart by course"""
+    fig_grades = px.bar(
+        course_stats_df,
+        x='Course Code',
+        y='Average %',
+        color='Average %',
+        title="Average Performance by Course",
+        color_continuous_scale='RdYlGn',
+        range_color=[0, 100],
+        text='Average %'
+    )
+    fig_grades.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
+    fig_grades.update_layout(
+        showlegend=False,
+        yaxis_title="Performance (%)",
+        xaxis_title="Course Code"
+    )
+    return fig_grades
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _make_carry_fig(course_stats_df):
+    """Carry percentage vs average grade scatter plot"""
+    fig_carry = px.scatter(
+        course_stats_df,
+        x='Carry %',
+        y='Average %',
+        size='Total Assignments',
+        color='Letter Grade',
+        color_discrete_map=GRADE_COLORS,
+        hover_data=['Course Name', 'Completed Assignments'],
+        title="Carry Performance vs Average Grade",
+        size_max=20
+    )
+    # Add diagonal reference line
+    fig_carry.add_shape(
+        type="line",
+        x0=0, y0=0, x1=100, y1=100,
+        line=dict(color="red", width=2, dash="dash"),
+    )
+    return fig_carry
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _make_pie_fig(grade_counts):
+    """Letter grade distribution pie chart"""
+    fig_pie = px.pie(
+        values=grade_counts.values,
+        names=grade_counts.index,
+        color=grade_counts.index,
+        title="Letter Grade Distribution",
+        color_discrete_map=GRADE_COLORS
+    )
+    # Keep slices in grade order; Plotly would otherwise sort them by size
+    fig_pie.update_traces(sort=False)
+    return fig_pie
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _make_completion_fig(course_stats_df):
+    """Assignment completion rate bar chart by course"""
+    fig_completion = px.bar(
+        course_stats_df,
+        x='Completion Rate',
+        y='Course Code',
+        orientation='h',
+        title="Assignment Completion Rate by Course",
+        color='Completion Rate',
+        color_continuous_scale='Blues',
+        text='Completion Rate'
+    )
+    fig_completion.update_traces(texttemplate='%{text:.0f}%', textposition='auto')
+    return fig_completion
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _make_trend_fig(carry_marks_df_sorted):
+    """Performance trend line chart over time"""
+    n_points = len(carry_marks_df_sorted)
+    fig_trend = px.line(
+        carry_marks_df_sorted,
+        x='date_added',
+        y='percentage',
+        color='course_code',
+        title="Performance Trends Over Time",
+        markers=n_points < TREND_MARKERS_MAX_POINTS,
+        line_shape='spline' if n_points < TREND_SPLINE_MAX_POINTS else 'linear',
+        render_mode='svg' if n_points < TREND_MARKERS_MAX_POINTS else 'webgl'
+    )
+    fig_trend.update_layout(
+        xaxis_title="Date",
+        yaxis_title="Performance (%)",
+        legend_title="Course",
+        hovermode='x unified'
+    )
+    # Add trend line
+    mean_pct = carry_marks_df_sorted['percentage'].mean()
+    fig_trend.add_hline(y=mean_pct, 
+                        line_dash="dash", line_color="red",
+                        annotation_text=f"Average: {mean_pct:.1f}%")
+    return fig_trend
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _make_hist_fig(carry_marks_df):
+    """Performance distribution histogram"""
+    fig_hist = px.histogram(
+        carry_marks_df,
+        x='percentage',
+        nbins=15,
+        title="Performance Distribution",
+        color_discrete_sequence=['lightblue'],
+        marginal="box"
+    )
+    mean_pct = carry_marks_df['percentage'].mean()
+    fig_hist.add_vline(x=mean_pct, 
+                       line_dash="dash", line_color="red",
+                       annotation_text=f"Mean: {mean_pct:.1f}%")
+    return fig_hist
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _make_box_fig(carry_marks_df):
+    """Performance box plot by course"""
+    fig_box = px.box(
+        carry_marks_df,
+        x='course_code',
+        y='percentage',
+        title="Performance by Course (Box Plot)",
+        color='course_code'
+    )
+    fig_box.update_layout(showlegend=False)
+    return fig_box
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _make_status_fig(status_by_course):
+    """Assignment status stacked bar chart by course"""
+    fig_status = px.bar(
+        status_by_course,
+        x='course_code',
+        y='count',
+        color='status',
+        title="Assignment Status by Course",
+        barmode='stack',
+        color_discrete_map={
+            'completed': '#2E8B57',
+            'pending': '#FF6347',
+            'in_progress': '#FFD700'
+        }
+    )
+    fig_status.update_layout(xaxis_title="Course Code", yaxis_title="Number of Assignments")
+    return fig_status
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _make_types_fig(type_counts):
+    """Assignment types pie chart"""
+    fig_types = px.pie(
+        values=type_counts.values,
+        names=type_counts.index,
+        title="Assignment Types Distribution",
+        color_discrete_sequence=px.colors.qualitative.Pastel
+    )
+    fig_types.update_traces(textposition='inside', textinfo='percent+label')
+    return fig_types
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _make_heatmap_fig(heatmap_counts):
+    """Assignment due date calendar heatmap"""
+    fig_heatmap = px.density_heatmap(
+        heatmap_counts,
+        x='week_of_year',
+        y='day_of_week',
+        z='assignment_count',
+        title="Assignment Due Dates Heatmap",
+        color_continuous_scale='Reds',
+        category_orders={"day_of_week": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]}
+    )
+    fig_heatmap.update_layout(
+        xaxis_title="Week of Year",
+        yaxis_title="Day of Week"
+    )
+    return fig_heatmap
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _make_workload_fig(weekly_workload):
+    """Weekly workload and completion rate chart"""
+    fig_workload = go.Figure()
+    
+    weeks = [str(week) for week in weekly_workload.index]
+    
+    # Add bars for total assignments
+    fig_workload.add_trace(go.Bar(
+        x=weeks,
+        y=weekly_workload['total'],
+        name='Total Assignments',
+        marker_color='lightblue',
+        yaxis='y'
+    ))
+    
+    # Add bars for completed assignments
+    fig_workload.add_trace(go.Bar(
+        x=weeks,
+        y=weekly_workload['completed'],
+        name='Completed Assignments',
+        marker_color='darkblue',
+        yaxis='y'
+    ))
+    
+    # Add line for completion rate
+    fig_workload.add_trace(go.Scatter(
+        x=weeks,
+        y=weekly_workload['completion_rate'],
+        mode='lines+markers',
+        name='Completion Rate (%)',
+        line=dict(color='red', width=3),
+        marker=dict(size=8),
+        yaxis='y2'
+    ))
+    
+    fig_workload.update_layout(
+        title="Weekly Assignment Workload and Completion Rate",
+        xaxis_title="Week",
+        yaxis=dict(title="Number of Assignments", side="left"),
+        yaxis2=dict(title="Completion Rate (%)", side="right", overlaying="y", range=[0, 100]),
+        legend=dict(x=0.01, y=0.99),
+        barmode='group'
+    )
+    return fig_workload
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _make_monthly_fig(monthly_data):
+    """Monthly assignment breakdown by status"""
+    fig_monthly = px.bar(
+        monthly_data,
+        x='month',
+        y='count',
+        color='status',
+        title="Monthly Assignment Distribution by Status",
+        barmode='stack'
+    )
+    return fig_monthly
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _to_csv(df):
+    """Serialize a DataFrame to CSV bytes for download"""
+    return df.to_csv(index=False).encode('utf-8')
 
 def analytics_tab():
     """Analytics and insights dashboard"""
     st.header("📊 Personal Insights & Analytics")
     
-    courses_df = get_courses_df()
-    carry_marks_df = get_carry_marks_df()
-    assignments_df = get_assignments_df()
+    courses_df, carry_marks_df, assignments_df = _load_all()
     
     if courses_df.empty:
         st.warning("Please add courses first to see analytics.")
         return
     
+    has_carry_marks = not carry_marks_df.empty
+    has_assignments = not assignments_df.empty
+    
+    # Assignment counts by status, and per course and status for the course table and status chart
+    status_totals = assignments_df['status'].value_counts()
+    if has_assignments:
+        status_counts = pd.crosstab(assignments_df['course_code'], assignments_df['status'])
+    else:
+        status_counts = pd.DataFrame(index=pd.Index([], dtype=object, name='course_code'))
+    
     # Overview metrics
     st.subheader("📈 Academic Overview")
     
@@ -29,28 +321,23 @@ def analytics_tab():
         st.metric("Total Courses", total_courses)
     
     with col2:
-        if not carry_marks_df.empty:
+        if has_carry_marks:
             # Calculate average performance based on percentages
-            if 'percentage' in carry_marks_df.columns:
-                avg_performance = carry_marks_df['percentage'].mean()
-            else:
-                # Calculate percentage from earned/max_possible
-                carry_marks_df['percentage'] = (carry_marks_df['earned'] / carry_marks_df['max_possible'] * 100).fillna(0)
-                avg_performance = carry_marks_df['percentage'].mean()
+            avg_performance = carry_marks_df['percentage'].mean()
             st.metric("Average Performance", f"{avg_performance:.1f}%")
         else:
             st.metric("Average Performance", "No data")
     
     with col3:
-        if not assignments_df.empty:
+        if has_assignments:
             completion_rate = calculate_completion_rate(assignments_df)
             st.metric("Assignment Completion", f"{completion_rate:.1f}%")
         else:
             st.metric("Assignment Completion", "No data")
     
     with col4:
-        if not assignments_df.empty:
-            pending_assignments = len(assignments_df[assignments_df['status'] == 'pending'])
+        if has_assignments:
+            pending_assignments = int(status_totals.get('pending', 0))
             st.metric("Pending Assignments", pending_assignments)
         else:
             st.metric("Pending Assignments", 0)
@@ -59,50 +346,55 @@ def analytics_tab():
     course_stats_df = pd.DataFrame()
     
     # Course performance analysis - BAR CHARTS
-    if not carry_marks_df.empty:
+    if has_carry_marks:
         st.markdown("---")
         st.subheader("🎯 Course Performance Analysis")
         
-        # Ensure percentage column exists
-        if 'percentage' not in carry_marks_df.columns:
-            carry_marks_df['percentage'] = (carry_marks_df['earned'] / carry_marks_df['max_possible'] * 100).fillna(0)
-        
         # Calculate comprehensive course statistics
-        course_stats = []
-        for _, course in courses_df.iterrows():
-            course_code = course['code']
-            course_name = course['name']
-            carry_pct = calculate_carry_percentage(course_code, carry_marks_df)
-            current_grade = calculate_current_grade(course_code, carry_marks_df, courses_df)
-            
-            # Calculate letter grade
-            course_marks = carry_marks_df[carry_marks_df['course_code'] == course_code]
-            if not course_marks.empty:
-                avg_percentage = course_marks['percentage'].mean()
-                letter_grade = get_grade_letter(avg_percentage)
-            else:
-                letter_grade = "N/A"
-                avg_percentage = 0
-            
-            # Count assignments for this course
-            course_assignments = assignments_df[assignments_df['course_code'] == course_code] if not assignments_df.empty else pd.DataFrame()
-            total_assignments = len(course_assignments)
-            completed_assignments = len(course_assignments[course_assignments['status'] == 'completed']) if not course_assignments.empty else 0
-            
-            course_stats.append({
-                'Course Code': course_code,
-                'Course Name': course_name,
-                'Carry %': carry_pct,
-                'Current Grade': current_grade,
-                'Average %': avg_percentage,
-                'Letter Grade': letter_grade,
-                'Total Assignments': total_assignments,
-                'Completed Assignments': completed_assignments,
-                'Carry Weight': course['carry_weight'],
-                'Exam Weight': course['exam_weight']
-            })
+        mark_stats = pd.DataFrame({
+            'Average %': compute_course_percentages(carry_marks_df),
+            'Current Grade': compute_course_contributions(carry_marks_df, courses_df)
+        })
+        
+        # Count assignments per course
+        assignment_stats = pd.DataFrame({
+            'Total Assignments': status_counts.sum(axis=1),
+            'Completed Assignments': status_counts.get('completed', 0)
+        })
+        
+        course_stats_df = courses_df.rename(columns={
+            'code': 'Course Code',
+            'name': 'Course Name',
+            'carry_weight': 'Carry Weight',
+            'exam_weight': 'Exam Weight'
+        })
+        course_stats_df = course_stats_df.merge(mark_stats, left_on='Course Code', right_index=True, how='left')
+        course_stats_df = course_stats_df.merge(assignment_stats, left_on='Course Code', right_index=True, how='left')
+        
+        has_marks = course_stats_df['Average %'].notna()
+        course_stats_df['Average %'] = course_stats_df['Average %'].fillna(0)
+        course_stats_df['Carry %'] = course_stats_df['Average %']
+        course_stats_df['Current Grade'] = course_stats_df['Current Grade'].fillna(0)
+        for col in ['Total Assignments', 'Completed Assignments']:
+            course_stats_df[col] = pd.to_numeric(course_stats_df[col].fillna(0), downcast='integer')
         
-        course_stats_df = pd.DataFrame(course_stats)
+        # Calculate letter grades
+        letter_grades = pd.Series(
+            pd.Categorical(get_grade_letters(course_stats_df['Average %']), categories=GRADE_ORDER, ordered=True),
+            index=course_stats_df.index
+        )
+        course_stats_df['Letter Grade'] = letter_grades.where(has_marks, 'N/A')
+        course_stats_df['Course Code'] = course_stats_df['Course Code'].astype('category')
+        
+        course_stats_df = course_stats_df[[
+            'Course Code', 'Course Name', 'Carry %', 'Current Grade', 'Average %', 'Letter Grade',
+            'Total Assignments', 'Completed Assignments', 'Carry Weight', 'Exam Weight'
+        ]].reset_index(drop=True)
+        grade_counts = course_stats_df['Letter Grade'].value_counts(sort=False)
+        grade_counts = grade_counts[grade_counts > 0]
+        
+        # Charts don't need float64 precision, but the table and CSV export keep it
+        plot_stats_df = _plot_frame(course_stats_df)
         
         # Performance dashboard with enhanced charts
         col1, col2 = st.columns(2)
@@ -110,43 +402,13 @@ def analytics_tab():
         with col1:
             # Enhanced Current grades bar chart
             if not course_stats_df.empty:
-                fig_grades = px.bar(
-                    course_stats_df,
-                    x='Course Code',
-                    y='Average %',
-                    color='Average %',
-                    title="Average Performance by Course",
-                    color_continuous_scale='RdYlGn',
-                    range_color=[0, 100],
-                    text='Average %'
-                )
-                fig_grades.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
-                fig_grades.update_layout(
-                    showlegend=False,
-                    yaxis_title="Performance (%)",
-                    xaxis_title="Course Code"
-                )
+                fig_grades = _make_grades_fig(plot_stats_df)
                 st.plotly_chart(fig_grades, use_container_width=True)
         
         with col2:
             # Enhanced scatter plot
             if not course_stats_df.empty:
-                fig_carry = px.scatter(
-                    course_stats_df,
-                    x='Carry %',
-                    y='Average %',
-                    size='Total Assignments',
-                    color='Letter Grade',
-                    hover_data=['Course Name', 'Completed Assignments'],
-                    title="Carry Performance vs Average Grade",
-                    size_max=20
-                )
-                # Add diagonal reference line
-                fig_carry.add_shape(
-                    type="line",
-                    x0=0, y0=0, x1=100, y1=100,
-                    line=dict(color="red", width=2, dash="dash"),
-                )
+                fig_carry = _make_carry_fig(plot_stats_df)
                 st.plotly_chart(fig_carry, use_container_width=True)
         
         # Letter Grade Distribution - PIE CHART
@@ -155,31 +417,16 @@ def analytics_tab():
             col1, col2 = st.columns(2)
             
             with col1:
-                grade_counts = course_stats_df['Letter Grade'].value_counts()
-                fig_pie = px.pie(
-                    values=grade_counts.values,
-                    names=grade_counts.index,
-                    title="Letter Grade Distribution",
-                    color_discrete_sequence=px.colors.qualitative.Set3
-                )
+                fig_pie = _make_pie_fig(grade_counts)
                 st.plotly_chart(fig_pie, use_container_width=True)
             
             with col2:
                 # Assignment completion by course - horizontal bar
                 if course_stats_df['Total Assignments'].sum() > 0:
-                    course_stats_df['Completion Rate'] = (course_stats_df['Completed Assignments'] / 
-                                                        course_stats_df['Total Assignments'] * 100).fillna(0)
-                    fig_completion = px.bar(
-                        course_stats_df,
-                        x='Completion Rate',
-                        y='Course Code',
-                        orientation='h',
-                        title="Assignment Completion Rate by Course",
-                        color='Completion Rate',
-                        color_continuous_scale='Blues',
-                        text='Completion Rate'
-                    )
-                    fig_completion.update_traces(texttemplate='%{text:.0f}%', textposition='auto')
+                    course_stats_df['Completion Rate'] = (
+                        course_stats_df['Completed Assignments'] / course_stats_df['Total Assignments'] * 100
+                    ).fillna(0)
+                    fig_completion = _make_completion_fig(_plot_frame(course_stats_df))
                     st.plotly_chart(fig_completion, use_container_width=True)
         
         # Detailed course table
@@ -192,217 +439,83 @@ def analytics_tab():
             st.markdown("---")
             st.subheader("📈 Performance Trends Over Time")
             
-            # Performance over time with enhanced styling
-            carry_marks_df_sorted = carry_marks_df.copy()
-            if 'date_added' not in carry_marks_df_sorted.columns:
-                carry_marks_df_sorted['date_added'] = datetime.now().strftime("%Y-%m-%d")
-            
-            carry_marks_df_sorted['date_added'] = pd.to_datetime(carry_marks_df_sorted['date_added'])
-            carry_marks_df_sorted = carry_marks_df_sorted.sort_values('date_added')
-            
-            fig_trend = px.line(
-                carry_marks_df_sorted,
-                x='date_added',
-                y='percentage',
-                color='course_code',
-                title="Performance Trends Over Time",
-                markers=True,
-                line_shape='spline'
-            )
-            fig_trend.update_layout(
-                xaxis_title="Date",
-                yaxis_title="Performance (%)",
-                legend_title="Course",
-                hovermode='x unified'
-            )
-            # Add trend line
-            fig_trend.add_hline(y=carry_marks_df_sorted['percentage'].mean(), 
-                              line_dash="dash", line_color="red",
-                              annotation_text=f"Average: {carry_marks_df_sorted['percentage'].mean():.1f}%")
-            st.plotly_chart(fig_trend, use_container_width=True)
-            
-            # Enhanced Performance distribution and box plots
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                fig_hist = px.histogram(
-                    carry_marks_df,
-                    x='percentage',
-                    nbins=15,
-                    title="Performance Distribution",
-                    color_discrete_sequence=['lightblue'],
-                    marginal="box"
-                )
-                fig_hist.add_vline(x=carry_marks_df['percentage'].mean(), 
-                                 line_dash="dash", line_color="red",
-                                 annotation_text=f"Mean: {carry_marks_df['percentage'].mean():.1f}%")
-                st.plotly_chart(fig_hist, use_container_width=True)
-            
-            with col2:
-                fig_box = px.box(
-                    carry_marks_df,
-                    x='course_code',
-                    y='percentage',
-                    title="Performance by Course (Box Plot)",
-                    color='course_code'
-                )
-                fig_box.update_layout(showlegend=False)
-                st.plotly_chart(fig_box, use_container_width=True)
+            # The heavier charts are only built once the user opts in
+            if st.checkbox("Show performance trends", key="show_trends"):
+                # Performance over time with enhanced styling
+                plot_marks_df = _plot_frame(carry_marks_df)
+                carry_marks_df_sorted = plot_marks_df.sort_values('date_added')
+                
+                fig_trend = _make_trend_fig(carry_marks_df_sorted)
+                st.plotly_chart(fig_trend, use_container_width=True)
+                
+                # Enhanced Performance distribution and box plots
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    fig_hist = _make_hist_fig(plot_marks_df)
+                    st.plotly_chart(fig_hist, use_container_width=True)
+                
+                with col2:
+                    fig_box = _make_box_fig(plot_marks_df)
+                    st.plotly_chart(fig_box, use_container_width=True)
     
     # Assignment analytics with enhanced visualizations
-    if not assignments_df.empty:
+    if has_assignments:
         st.markdown("---")
         st.subheader("📋 Assignment Analytics")
         
-        # Ensure due_date is datetime
-        assignments_df_copy = assignments_df.copy()
-        assignments_df_copy['due_date'] = pd.to_datetime(assignments_df_copy['due_date'])
-        
         col1, col2 = st.columns(2)
         
         with col1:
             # Enhanced Assignment status by course
-            status_by_course = assignments_df.groupby(['course_code', 'status']).size().reset_index(name='count')
-            fig_status = px.bar(
-                status_by_course,
-                x='course_code',
-                y='count',
-                color='status',
-                title="Assignment Status by Course",
-                barmode='stack',
-                color_discrete_map={
-                    'completed': '#2E8B57',
-                    'pending': '#FF6347',
-                    'in_progress': '#FFD700'
-                }
-            )
-            fig_status.update_layout(xaxis_title="Course Code", yaxis_title="Number of Assignments")
+            status_by_course = status_counts.stack().reset_index(name='count')
+            status_by_course = status_by_course[status_by_course['count'] > 0]
+            fig_status = _make_status_fig(status_by_course)
             st.plotly_chart(fig_status, use_container_width=True)
         
         with col2:
             # Enhanced Assignment types distribution - PIE CHART
             type_counts = assignments_df['type'].value_counts()
-            fig_types = px.pie(
-                values=type_counts.values,
-                names=type_counts.index,
-                title="Assignment Types Distribution",
-                color_discrete_sequence=px.colors.qualitative.Pastel
-            )
-            fig_types.update_traces(textposition='inside', textinfo='percent+label')
+            fig_types = _make_types_fig(type_counts)
             st.plotly_chart(fig_types, use_container_width=True)
         
         # Enhanced Calendar heatmap - HEAT MAP
         st.subheader("📅 Assignment Calendar Heatmap")
         
-        # Create a more comprehensive heatmap
-        if not assignments_df_copy.empty:
-            # Create date range for current semester (adjust as needed)
-            start_date = assignments_df_copy['due_date'].min().replace(day=1)
-            end_date = assignments_df_copy['due_date'].max() + timedelta(days=30)
-            
-            # Create daily assignment counts
-            daily_counts = assignments_df_copy.groupby(assignments_df_copy['due_date'].dt.date).size().reset_index(name='assignment_count')
-            daily_counts['due_date'] = pd.to_datetime(daily_counts['due_date'])
-            
-            # Create a complete date range
-            date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-            complete_df = pd.DataFrame({'due_date': date_range})
-            complete_df = complete_df.merge(daily_counts, on='due_date', how='left')
-            complete_df['assignment_count'] = complete_df['assignment_count'].fillna(0)
-            
-            # Add calendar components
-            complete_df['day_of_week'] = complete_df['due_date'].dt.day_name()
-            complete_df['week_of_year'] = complete_df['due_date'].dt.isocalendar().week
-            complete_df['month'] = complete_df['due_date'].dt.strftime('%Y-%m')
+        if st.checkbox("Show calendar heatmap", key="show_heatmap"):
+            # Count assignments per (week, weekday); empty cells are left for the heatmap to fill
+            due_dates = assignments_df['due_date']
+            heatmap_counts = assignments_df.groupby([
+                due_dates.dt.isocalendar().week.rename('week_of_year'),
+                due_dates.dt.day_name().rename('day_of_week')
+            ]).size().reset_index(name='assignment_count')
             
             # Create heatmap
-            fig_heatmap = px.density_heatmap(
-                complete_df,
-                x='week_of_year',
-                y='day_of_week',
-                z='assignment_count',
-                title="Assignment Due Dates Heatmap",
-                color_continuous_scale='Reds',
-                category_orders={"day_of_week": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]}
-            )
-            fig_heatmap.update_layout(
-                xaxis_title="Week of Year",
-                yaxis_title="Day of Week"
-            )
+            fig_heatmap = _make_heatmap_fig(heatmap_counts)
             st.plotly_chart(fig_heatmap, use_container_width=True)
         
         # Enhanced Weekly workload trends with dual axis
-        assignments_df_copy['week'] = assignments_df_copy['due_date'].dt.to_period('W')
-        weekly_workload = assignments_df_copy.groupby('week').agg({
-            'title': 'count',
-            'status': lambda x: (x == 'completed').sum()
-        }).rename(columns={'title': 'total', 'status': 'completed'})
+        week = assignments_df['due_date'].dt.to_period('W').rename('week')
+        is_completed = (assignments_df['status'] == 'completed').astype('int8')
+        weekly_workload = is_completed.groupby(week).agg(total='size', completed='sum')
         weekly_workload['completion_rate'] = (weekly_workload['completed'] / weekly_workload['total'] * 100).fillna(0)
         
         if not weekly_workload.empty:
             st.subheader("📊 Weekly Workload and Completion Trends")
             
-            fig_workload = go.Figure()
-            
-            weeks = [str(week) for week in weekly_workload.index]
-            
-            # Add bars for total assignments
-            fig_workload.add_trace(go.Bar(
-                x=weeks,
-                y=weekly_workload['total'],
-                name='Total Assignments',
-                marker_color='lightblue',
-                yaxis='y'
-            ))
-            
-            # Add bars for completed assignments
-            fig_workload.add_trace(go.Bar(
-                x=weeks,
-                y=weekly_workload['completed'],
-                name='Completed Assignments',
-                marker_color='darkblue',
-                yaxis='y'
-            ))
-            
-            # Add line for completion rate
-            fig_workload.add_trace(go.Scatter(
-                x=weeks,
-                y=weekly_workload['completion_rate'],
-                mode='lines+markers',
-                name='Completion Rate (%)',
-                line=dict(color='red', width=3),
-                marker=dict(size=8),
-                yaxis='y2'
-            ))
-            
-            fig_workload.update_layout(
-                title="Weekly Assignment Workload and Completion Rate",
-                xaxis_title="Week",
-                yaxis=dict(title="Number of Assignments", side="left"),
-                yaxis2=dict(title="Completion Rate (%)", side="right", overlaying="y", range=[0, 100]),
-                legend=dict(x=0.01, y=0.99),
-                barmode='group'
-            )
-            
+            fig_workload = _make_workload_fig(weekly_workload)
             st.plotly_chart(fig_workload, use_container_width=True)
         
         # Monthly assignment breakdown
-        if not assignments_df_copy.empty:
-            st.subheader("📅 Monthly Assignment Breakdown")
-            monthly_data = assignments_df_copy.groupby([
-                assignments_df_copy['due_date'].dt.to_period('M'), 
+        st.subheader("📅 Monthly Assignment Breakdown")
+        if st.checkbox("Show monthly breakdown", key="show_monthly"):
+            monthly_data = assignments_df.groupby([
+                assignments_df['due_date'].dt.to_period('M'), 
                 'status'
-            ]).size().reset_index(name='count')
+            ], observed=True).size().reset_index(name='count')
             monthly_data['month'] = monthly_data['due_date'].astype(str)
             
-            fig_monthly = px.bar(
-                monthly_data,
-                x='month',
-                y='count',
-                color='status',
-                title="Monthly Assignment Distribution by Status",
-                barmode='stack'
-            )
+            fig_monthly = _make_monthly_fig(monthly_data)
             st.plotly_chart(fig_monthly, use_container_width=True)
     
     # Enhanced Insights and recommendations
@@ -412,11 +525,7 @@ def analytics_tab():
     insights = []
     
     # Performance insights
-    if not carry_marks_df.empty:
-        if 'percentage' not in carry_marks_df.columns:
-            carry_marks_df['percentage'] = (carry_marks_df['earned'] / carry_marks_df['max_possible'] * 100).fillna(0)
-        
-        avg_performance = carry_marks_df['percentage'].mean()
+    if has_carry_marks:
         std_performance = carry_marks_df['percentage'].std()
         
         if avg_performance >= 85:
@@ -431,14 +540,17 @@ def analytics_tab():
         
         # Identify weakest and strongest courses
         if len(course_stats_df) > 0:
-            weakest_course = course_stats_df.loc[course_stats_df['Average %'].idxmin()]
-            strongest_course = course_stats_df.loc[course_stats_df['Average %'].idxmax()]
+            # One stable sort serves both ends; ties resolve to the first course, as with idxmin/idxmax
+            avg_pct = course_stats_df['Average %'].to_numpy()
+            order = avg_pct.argsort(kind='stable')
+            sorted_avg = avg_pct[order]
+            weakest_course = course_stats_df.iloc[order[0]]
+            strongest_course = course_stats_df.iloc[order[sorted_avg.searchsorted(sorted_avg[-1])]]
             insights.append(f"📚 **Focus area:** {weakest_course['Course Code']} has your lowest average ({weakest_course['Average %']:.1f}%).")
             insights.append(f"⭐ **Strength:** {strongest_course['Course Code']} is your best performing course ({strongest_course['Average %']:.1f}%).")
     
     # Assignment insights
-    if not assignments_df.empty:
-        completion_rate = calculate_completion_rate(assignments_df)
+    if has_assignments:
         if completion_rate >= 90:
             insights.append("✅ **Great job on assignments!** You're staying on top of your work.")
         elif completion_rate >= 70:
@@ -447,21 +559,12 @@ def analytics_tab():
             insights.append("⏰ **Assignment management needs attention.** Consider better time management strategies.")
         
         # Check for overdue assignments
-        today = datetime.now().date()
-        overdue_count = 0
-        upcoming_count = 0
-        
-        for _, assignment in assignments_df.iterrows():
-            if assignment['status'] == 'pending':
-                try:
-                    due_date = pd.to_datetime(assignment['due_date']).date()
-                    days_diff = (due_date - today).days
-                    if days_diff < 0:
-                        overdue_count += 1
-                    elif days_diff <= 7:
-                        upcoming_count += 1
-                except:
-                    pass
+        today = pd.Timestamp(datetime.now().date())
+        due_dates = assignments_df['due_date'].dt.normalize()
+        days_diff = (due_dates - today).dt.days
+        is_pending = assignments_df['status'] == 'pending'
+        overdue_count = int((is_pending & (days_diff < 0)).sum())
+        upcoming_count = int((is_pending & days_diff.between(0, 7)).sum())
         
         if overdue_count > 0:
             insights.append(f"🚨 **Urgent:** You have {overdue_count} overdue assignment(s). Address these immediately.")
@@ -479,34 +582,35 @@ def analytics_tab():
     st.markdown("---")
     st.subheader("📥 Data Export")
     
+    export_date = datetime.now().strftime("%Y%m%d")
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        if not carry_marks_df.empty:
-            csv_carry = carry_marks_df.to_csv(index=False)
+        if has_carry_marks:
+            csv_carry = _to_csv(carry_marks_df)
             st.download_button(
                 label="📊 Download Carry Marks",
                 data=csv_carry,
-                file_name=f"carry_marks_{datetime.now().strftime('%Y%m%d')}.csv",
+                file_name=f"carry_marks_{export_date}.csv",
                 mime="text/csv"
             )
     
     with col2:
-        if not assignments_df.empty:
-            csv_assignments = assignments_df.to_csv(index=False)
+        if has_assignments:
+            csv_assignments = _to_csv(assignments_df)
             st.download_button(
                 label="📋 Download Assignments",
                 data=csv_assignments,
-                file_name=f"assignments_{datetime.now().strftime('%Y%m%d')}.csv",
+                file_name=f"assignments_{export_date}.csv",
                 mime="text/csv"
             )
     
     with col3:
         if not course_stats_df.empty:
-            csv_courses = course_stats_df.to_csv(index=False)
+            csv_courses = _to_csv(course_stats_df)
             st.download_button(
                 label="📚 Download Course Stats",
                 data=csv_courses,
-                file_name=f"course_statistics_{datetime.now().strftime('%Y%m%d')}.csv",
+                file_name=f"course_statistics_{export_date}.csv",
                 mime="text/csv"
             )
\ No newline at end of file
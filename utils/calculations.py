@@ -2,6 +2,22 @@ import pandas as pd
 from datetime import datetime
 import numpy as np
 
+# GPA points per letter grade
+_GRADE_POINTS = pd.Series({
+    'A+': 4.0, 'A': 4.0, 'A-': 3.7,
+    'B+': 3.3, 'B': 3.0, 'B-': 2.7,
+    'C+': 2.3, 'C': 2.0, 'C-': 1.7,
+    'F': 0.0, 'N/A': 0.0
+})
+
+# Lower edge of each passing grade, and the letters they map to (below 50 is F)
+_GRADE_EDGES = np.array([50, 55, 60, 65, 70, 75, 80, 85, 90])
+_LABELS_WITH_F = np.array(['F', 'C-', 'C', 'C+', 'B-', 'B', 'B+', 'A-', 'A', 'A+'])
+
+# get_grade_letter computes the label index arithmetically, which needs evenly spaced edges
+_GRADE_STEP = float(_GRADE_EDGES[1] - _GRADE_EDGES[0])
+assert np.all(np.diff(_GRADE_EDGES) == _GRADE_STEP), "grade edges must be evenly spaced"
+
 def calculate_carry_percentage(course_code, carry_marks_df):
     """Calculate carry percentage for a specific course"""
     if carry_marks_df.empty:
@@ -24,6 +40,41 @@ def calculate_carry_percentage(course_code, carry_marks_df):
     
     return (total_earned / total_max) * 100
 
+def compute_course_percentages(carry_marks_df):
+    """Calculate carry percentage for every course in one pass"""
+    if carry_marks_df.empty:
+        return pd.Series(dtype=float)
+    
+    course_marks = carry_marks_df.groupby('course_code', sort=False, observed=True)
+    
+    # If percentage column exists, use average
+    if 'percentage' in carry_marks_df.columns:
+        return course_marks['percentage'].mean()
+    
+    # Otherwise calculate from earned/max_possible
+    total_earned = course_marks['earned'].sum()
+    total_max = course_marks['max_possible'].sum()
+    
+    return (total_earned / total_max * 100).where(total_max != 0, 0)
+
+def compute_course_contributions(carry_marks_df, courses_df):
+    """Calculate current grade contribution for every course in one pass"""
+    if carry_marks_df.empty or courses_df.empty:
+        return pd.Series(dtype=float)
+    
+    courses = carry_marks_df['course_code'].isin(courses_df['code'])
+    carry_marks_df = carry_marks_df[courses]
+    
+    # If we have weighted contributions, use those
+    if 'final_contribution' in carry_marks_df.columns:
+        return carry_marks_df.groupby('course_code', sort=False, observed=True)['final_contribution'].sum()
+    
+    # Fallback to percentage-based calculation
+    carry_weights = courses_df.drop_duplicates('code').set_index('code')['carry_weight']
+    percentages = compute_course_percentages(carry_marks_df)
+    
+    return percentages / 100 * carry_weights.reindex(percentages.index)
+
 def calculate_final_exam_requirement(target_grade, carry_percentage, carry_weight, exam_weight):
     """Calculate minimum final exam mark needed to achieve target grade"""
     if exam_weight == 0:
@@ -66,36 +117,36 @@ def calculate_current_grade(course_code, carry_marks_df, courses_df):
 
 def get_grade_letter(percentage):
     """Convert percentage to letter grade"""
-    if pd.isna(percentage) or percentage < 0:
-        return "F"
-    elif percentage >= 90:
-        return "A+"
-    elif percentage >= 85:
-        return "A"
-    elif percentage >= 80:
-        return "A-"
-    elif percentage >= 75:
-        return "B+"
-    elif percentage >= 70:
-        return "B"
-    elif percentage >= 65:
-        return "B-"
-    elif percentage >= 60:
-        return "C+"
-    elif percentage >= 55:
-        return "C"
-    elif percentage >= 50:
-        return "C-"
-    else:
+    if pd.isna(percentage):
         return "F"
+    
+    # Clamping to one step below the first edge up to the last edge keeps the index
+    # in range and keeps infinities away from int()
+    percentage = min(max(float(percentage), _GRADE_EDGES[0] - _GRADE_STEP), _GRADE_EDGES[-1])
+    index = int((percentage - _GRADE_EDGES[0]) // _GRADE_STEP) + 1
+    return str(_LABELS_WITH_F[index])
+
+def get_grade_letters(percentages):
+    """Convert an array of percentages to letter grades"""
+    values = np.asarray(pd.to_numeric(percentages, errors='coerce'), dtype=float)
+    letters = _LABELS_WITH_F[np.searchsorted(_GRADE_EDGES, values, side='right')]
+    
+    # searchsorted sorts NaN past every edge, so send missing marks to F explicitly
+    return np.where(np.isnan(values), 'F', letters)
 
 def calculate_days_until_due(due_date_str):
     """Calculate days until due date"""
+    if pd.isna(due_date_str):
+        return 0
+    
     try:
-        due_date = datetime.strptime(due_date_str, "%Y-%m-%d")
-        today = datetime.now()
-        delta = due_date - today
-        return delta.days
+        # np.datetime64 parses ISO strings in C and takes already-parsed dates as they are
+        due_date = np.datetime64(due_date_str)
+        # Partial dates such as '2026-10' parse to month or year precision; treat them as invalid
+        if np.isnat(due_date) or np.datetime_data(due_date.dtype)[0] in ('Y', 'M', 'W'):
+            return 0
+        now = np.datetime64(datetime.now())
+        return int((due_date - now) // np.timedelta64(1, 'D'))
     except:
         return 0
 
@@ -104,14 +155,14 @@ def get_weekly_workload(assignments_df):
     if assignments_df.empty:
         return pd.DataFrame()
     
-    assignments_df = assignments_df.copy()
-    assignments_df['due_date'] = pd.to_datetime(assignments_df['due_date'])
-    assignments_df['week'] = assignments_df['due_date'].dt.to_period('W')
+    # Group standalone Series by week rather than copying the frame to add columns
+    week = pd.to_datetime(assignments_df['due_date']).dt.to_period('W').rename('week')
+    is_pending = (assignments_df['status'] == 'pending').astype('int32')
     
-    weekly_summary = assignments_df.groupby('week').agg({
-        'title': 'count',
-        'status': lambda x: (x == 'pending').sum()
-    }).rename(columns={'title': 'total_assignments', 'status': 'pending_assignments'})
+    weekly_summary = pd.DataFrame({
+        'total_assignments': assignments_df['title'].groupby(week).count(),
+        'pending_assignments': is_pending.groupby(week).sum()
+    })
     
     return weekly_summary.reset_index()
 
@@ -120,7 +171,7 @@ def calculate_completion_rate(assignments_df):
     if assignments_df.empty:
         return 0
     
-    completed = len(assignments_df[assignments_df['status'] == 'completed'])
+    completed = int((assignments_df['status'] == 'completed').sum())
     total = len(assignments_df)
     
     return (completed / total) * 100 if total > 0 else 0
@@ -130,25 +181,15 @@ def calculate_weighted_gpa(course_stats_df):
     if course_stats_df.empty:
         return 0
     
-    # Convert letter grades to GPA points
-    grade_points = {
-        'A+': 4.0, 'A': 4.0, 'A-': 3.7,
-        'B+': 3.3, 'B': 3.0, 'B-': 2.7,
-        'C+': 2.3, 'C': 2.0, 'C-': 1.7,
-        'F': 0.0, 'N/A': 0.0
-    }
-    
-    total_points = 0
-    total_weight = 0
+    if 'Letter Grade' not in course_stats_df.columns or 'Carry Weight' not in course_stats_df.columns:
+        return 0
     
-    for _, row in course_stats_df.iterrows():
-        if 'Letter Grade' in row and 'Carry Weight' in row:
-            points = grade_points.get(row['Letter Grade'], 0.0)
-            weight = row['Carry Weight']
-            total_points += points * weight
-            total_weight += weight
+    # Convert letter grades to GPA points
+    points = course_stats_df['Letter Grade'].astype(object).map(_GRADE_POINTS).fillna(0.0).to_numpy(dtype=float)
+    weights = course_stats_df['Carry Weight'].to_numpy(dtype=float)
+    total_weight = weights.sum()
     
-    return (total_points / total_weight) if total_weight > 0 else 0
+    return float(np.dot(points, weights) / total_weight) if total_weight > 0 else 0
 
 def get_performance_trend(carry_marks_df):
     """Calculate performance trend (improving, declining, stable)"""
@@ -167,13 +208,14 @@ def get_performance_trend(carry_marks_df):
     df = df.sort_values('date_added')
     
     # Calculate trend using linear regression
-    x = np.arange(len(df))
-    y = df['percentage'].values
+    y = df['percentage'].to_numpy(dtype=float)
+    n = len(y)
     
-    if len(x) < 2:
+    if n < 2:
         return "Insufficient data"
     
-    slope = np.polyfit(x, y, 1)[0]
+    # Least-squares slope against x = 0..n-1 in closed form
+    slope = 12 * (np.dot(np.arange(n), y) - (n - 1) / 2 * y.sum()) / (n * (n * n - 1))
     
     if slope > 2:
         return "Improving"
@@ -197,13 +239,12 @@ def calculate_study_recommendations(course_stats_df, assignments_df):
     
     # Find courses with low assignment completion
     if not assignments_df.empty:
-        course_completion = assignments_df.groupby('course_code').apply(
-            lambda x: (x['status'] == 'completed').sum() / len(x) * 100
-        ).reset_index(name='completion_rate')
+        is_completed = (assignments_df['status'] == 'completed').astype('int8')
+        completion_rates = is_completed.groupby(assignments_df['course_code'], observed=True).mean() * 100
         
-        low_completion = course_completion[course_completion['completion_rate'] < 80]
-        for _, course in low_completion.iterrows():
-            recommendations.append(f"📝 Improve assignment completion for {course['course_code']} (current: {course['completion_rate']:.1f}%)")
+        low_completion = completion_rates[completion_rates < 80]
+        for course_code, completion_rate in low_completion.items():
+            recommendations.append(f"📝 Improve assignment completion for {course_code} (current: {completion_rate:.1f}%)")
     
     # General recommendations based on overall performance
     if not course_stats_df.empty:
@@ -222,10 +263,13 @@ def calculate_time_to_deadline(assignments_df):
     if assignments_df.empty:
         return pd.DataFrame()
     
-    pending_assignments = assignments_df[assignments_df['status'] == 'pending'].copy()
+    # Boolean indexing already builds a new frame; the shallow copy only drops pandas'
+    # link to the parent so the columns below are set in place without a warning
+    pending_assignments = assignments_df[assignments_df['status'] == 'pending'].copy(deep=False)
     if pending_assignments.empty:
         return pd.DataFrame()
     
+    # No-op when due_date is already datetime64, as get_assignments_df returns it
     pending_assignments['due_date'] = pd.to_datetime(pending_assignments['due_date'])
     pending_assignments['days_remaining'] = (
         pending_assignments['due_date'] - pd.Timestamp.now()
@@ -238,7 +282,7 @@ def calculate_workload_balance(assignments_df):
     if assignments_df.empty:
         return {}
     
-    course_workload = assignments_df.groupby('course_code').size().to_dict()
+    course_workload = assignments_df.groupby('course_code', observed=True).size().to_dict()
     total_assignments = len(assignments_df)
     
     balance_score = {}
@@ -128,6 +128,10 @@ def initialize_session_state():
     # Add a flag to track if sample data has been loaded
     if 'sample_data_loaded' not in st.session_state:
         st.session_state.sample_data_loaded = False
+    
+    # Bumped by every mutator so the cached DataFrames know when to rebuild
+    if 'data_version' not in st.session_state:
+        st.session_state.data_version = 0
 
 def load_sample_data():
     """Load sample data for demonstration"""
@@ -135,18 +139,49 @@ def load_sample_data():
         st.session_state.carry_marks = get_sample_carry_marks()
         st.session_state.assignments = get_sample_assignments()
         st.session_state.sample_data_loaded = True
+        _mark_data_changed()
         return True
     return False
 
+def _to_categories(df, columns):
+    """Store low-cardinality label columns, which are grouped and filtered often, as categoricals"""
+    for col in columns:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+
+def _mark_data_changed():
+    """Invalidate the cached DataFrames after the session-state records change"""
+    st.session_state.data_version = st.session_state.get('data_version', 0) + 1
+
+def _cached_df(name, records, build):
+    """Return a copy of the DataFrame built from records, rebuilding only when they change"""
+    # Frames live in session_state, so they are per session. The key is the mutator
+    # version plus the list's identity and length, which also catches lists replaced
+    # or appended to directly, without hashing the records themselves
+    cache = st.session_state.setdefault('_df_cache', {})
+    key = (st.session_state.get('data_version', 0), id(records), len(records))
+    if name not in cache or cache[name][0] != key:
+        cache[name] = (key, build(records))
+    
+    # Callers add and convert columns, so they get a copy rather than the cached frame
+    return cache[name][1].copy()
+
+def _build_courses_df(courses):
+    """Build the courses DataFrame from session-state records"""
+    return pd.DataFrame(courses)
+
 def get_courses_df():
     """Get courses as DataFrame"""
-    df = pd.DataFrame(st.session_state.courses)
-    return df
+    return _cached_df('courses', st.session_state.courses, _build_courses_df)
 
 def get_carry_marks_df():
     """Get carry marks as DataFrame with proper data types"""
-    if st.session_state.carry_marks:
-        df = pd.DataFrame(st.session_state.carry_marks)
+    return _cached_df('carry_marks', st.session_state.carry_marks, _build_carry_marks_df)
+
+def _build_carry_marks_df(carry_marks):
+    """Build the carry marks DataFrame from session-state records"""
+    if carry_marks:
+        df = pd.DataFrame(carry_marks)
         
         # Ensure proper data types
         numeric_columns = ['earned', 'max_possible', 'weight_percentage', 'final_contribution']
@@ -164,6 +199,8 @@ def get_carry_marks_df():
         if 'date_added' not in df.columns:
             df['date_added'] = datetime.now().strftime("%Y-%m-%d")
         
+        _to_categories(df, ['course_code', 'element_type'])
+        
         return df
     
     return pd.DataFrame(columns=[
@@ -174,14 +211,18 @@ def get_carry_marks_df():
 
 def get_assignments_df():
     """Get assignments as DataFrame with proper data types"""
-    if st.session_state.assignments:
-        df = pd.DataFrame(st.session_state.assignments)
+    return _cached_df('assignments', st.session_state.assignments, _build_assignments_df)
+
+def _build_assignments_df(assignments):
+    """Build the assignments DataFrame from session-state records"""
+    if assignments:
+        df = pd.DataFrame(assignments)
         
-        # Ensure due_date is in proper format
+        # Parse due_date once here; callers get datetime64 values
         if 'due_date' in df.columns:
             df['due_date'] = pd.to_datetime(df['due_date'], errors='coerce')
-            # Convert back to string format for consistency
-            df['due_date'] = df['due_date'].dt.strftime('%Y-%m-%d')
+        
+        _to_categories(df, ['course_code', 'status', 'type'])
         
         return df
     
@@ -192,11 +233,13 @@ def get_assignments_df():
 def add_course(course_data):
     """Add a new course"""
     st.session_state.courses.append(course_data)
+    _mark_data_changed()
 
 def update_course(index, course_data):
     """Update an existing course"""
     if 0 <= index < len(st.session_state.courses):
         st.session_state.courses[index] = course_data
+        _mark_data_changed()
 
 def delete_course(index):
     """Delete a course"""
@@ -207,6 +250,7 @@ def delete_course(index):
         st.session_state.assignments = [a for a in st.session_state.assignments if a.get('course_code') != course_code]
         st.session_state.final_exams = [fe for fe in st.session_state.final_exams if fe.get('course_code') != course_code]
         del st.session_state.courses[index]
+        _mark_data_changed()
 
 def add_carry_mark(carry_data):
     """Add a new carry mark entry"""
@@ -223,20 +267,24 @@ def add_carry_mark(carry_data):
     
     carry_data['date_added'] = datetime.now().strftime("%Y-%m-%d")
     st.session_state.carry_marks.append(carry_data)
+    _mark_data_changed()
 
 def add_assignment(assignment_data):
     """Add a new assignment"""
     st.session_state.assignments.append(assignment_data)
+    _mark_data_changed()
 
 def update_assignment_status(index, new_status):
     """Update assignment status"""
     if 0 <= index < len(st.session_state.assignments):
         st.session_state.assignments[index]['status'] = new_status
+        _mark_data_changed()
 
 def delete_assignment(index):
     """Delete an assignment"""
     if 0 <= index < len(st.session_state.assignments):
         del st.session_state.assignments[index]
+        _mark_data_changed()
 
 def update_carry_mark(index, carry_data):
     """Update an existing carry mark"""
@@ -252,11 +300,13 @@ def update_carry_mark(index, carry_data):
             carry_data['final_contribution'] = (percentage / 100) * weight
         
         st.session_state.carry_marks[index] = carry_data
+        _mark_data_changed()
 
 def delete_carry_mark(index):
     """Delete a carry mark"""
     if 0 <= index < len(st.session_state.carry_marks):
         del st.session_state.carry_marks[index]
+        _mark_data_changed()
 
 def export_data_to_csv():
     """Export all data to CSV format"""
@@ -279,6 +329,7 @@ def import_data_from_dict(data_dict):
         if 'assignments' in data_dict:
             st.session_state.assignments = data_dict['assignments'].to_dict('records') if isinstance(data_dict['assignments'], pd.DataFrame) else data_dict['assignments']
         
+        _mark_data_changed()
         return True
     except Exception as e:
         st.error(f"Error importing data: {str(e)}")
@@ -295,7 +346,7 @@ def get_course_summary():
         'total_assessments': len(carry_marks_df),
         'total_assignments': len(assignments_df),
         'avg_performance': carry_marks_df['percentage'].mean() if not carry_marks_df.empty else 0,
-        'completion_rate': (len(assignments_df[assignments_df['status'] == 'completed']) / len(assignments_df) * 100) if not assignments_df.empty else 0
+        'completion_rate': ((assignments_df['status'] == 'completed').sum() / len(assignments_df) * 100) if not assignments_df.empty else 0
     }
     
     return summary